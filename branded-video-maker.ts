@@ -4,8 +4,9 @@ import { processTemplate } from './lib/template';
 import { createEnhancedVideo } from './lib/enhanced-video';
 import { AudioProcessor } from './lib/audio-processor';
 import path from 'path';
-import { existsSync, mkdirSync, readFileSync } from 'fs';
+import { readFileSync } from 'fs';
 import { loadCustomFonts } from './lib/fonts';
+import { ensureDirExists } from './lib/utils';
 
 // Load environment variables
 config();
@@ -90,9 +91,7 @@ async function createBrandedVideo(
     
     // Ensure output directory exists
     const outputDir = path.dirname(outputPath);
-    if (!existsSync(outputDir)) {
-      mkdirSync(outputDir, { recursive: true });
-    }
+    ensureDirExists(outputDir);
     
     // Load brand styling
     console.log('Loading brand style guide...');
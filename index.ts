@@ -3,15 +3,13 @@ import { generateScript } from "./lib/gpt";
 import { generateImages } from "./lib/images";
 import { generateAudio } from "./lib/audio";
 import { stitchVideo } from "./lib/video";
-import * as fs from 'fs';
+import { ensureDirExists } from './lib/utils';
 
 // Load environment variables
 config();
 
 // Create output directory if it doesn't exist
-if (!fs.existsSync('./output')) {
-  fs.mkdirSync('./output', { recursive: true });
-}
+ensureDirExists('./output');
 
 // Verify API key is available
 if (!process.env.OPENAI_API_KEY) {
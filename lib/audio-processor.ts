@@ -5,7 +5,6 @@ import { createWriteStream } from 'fs';
 import { tmpdir } from 'os';
 import { join } from 'path';
 import { v4 as uuidv4 } from 'uuid';
-import { promisify } from 'util';
 import { unlink } from 'fs/promises';
 
 if (!ffmpegPath) {
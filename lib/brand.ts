@@ -1,7 +1,6 @@
-import { readFileSync, existsSync, readdirSync } from 'fs';
+import { readFileSync, existsSync, readdirSync, statSync } from 'fs';
 import path from 'path';
 import { VideoTemplate, VideoSection, VideoElement } from '../types/video';
-import artistPromoTemplate from '../templates/artist-promo';
 
 interface FontSize {
   heading: number;
@@ -71,6 +70,22 @@ export interface PromoAsset {
   dateCreated?: string;
 }
 
+// Promo asset type by lowercase file extension
+const ASSET_TYPES_BY_EXTENSION: Record<string, string> = {
+  '.jpg': 'image',
+  '.jpeg': 'image',
+  '.png': 'image',
+  '.gif': 'image',
+  '.mp4': 'video',
+  '.mov': 'video',
+  '.avi': 'video',
+  '.webm': 'video',
+  '.mp3': 'audio',
+  '.wav': 'audio',
+  '.ogg': 'audio',
+  '.txt': 'text'
+};
+
 /**
  * Loads brand style guide from JSON file
  */
@@ -84,6 +99,21 @@ export function loadBrandStyle(stylePath: string = './brand/style-guide.json'):
   }
 }
 
+/**
+ * Reads a template JSON file and validates its structure
+ */
+function readTemplateFile(templateFile: string): VideoTemplate {
+  const templateContent = readFileSync(templateFile, 'utf-8');
+  const template = JSON.parse(templateContent) as VideoTemplate;
+  
+  // Validate template structure
+  if (!template.templateName || !template.templateType || !template.scriptTemplate || !template.sections) {
+    throw new Error(`Invalid template structure in ${templateFile}`);
+  }
+  
+  return template;
+}
+
 /**
  * Loads a specific template by type
  */
@@ -93,13 +123,7 @@ export function loadTemplate(templateType: string): VideoTemplate {
     
     if (existsSync(templateFile)) {
       console.log(`Loading template from ${templateFile}...`);
-      const templateContent = readFileSync(templateFile, 'utf-8');
-      const template = JSON.parse(templateContent) as VideoTemplate;
-      
-      // Validate template structure
-      if (!template.templateName || !template.templateType || !template.scriptTemplate || !template.sections) {
-        throw new Error(`Invalid template structure in ${templateFile}`);
-      }
+      const template = readTemplateFile(templateFile);
       
       console.log('Template structure:', {
         name: template.templateName,
@@ -115,15 +139,7 @@ export function loadTemplate(templateType: string): VideoTemplate {
     const files = readdirSync('./templates');
     for (const file of files) {
       if (file.includes(templateType) && file.endsWith('.json')) {
-        const templateContent = readFileSync(path.join('./templates', file), 'utf-8');
-        const template = JSON.parse(templateContent) as VideoTemplate;
-        
-        // Validate template structure
-        if (!template.templateName || !template.templateType || !template.scriptTemplate || !template.sections) {
-          throw new Error(`Invalid template structure in ${file}`);
-        }
-        
-        return template;
+        return readTemplateFile(path.join('./templates', file));
       }
     }
     
@@ -146,30 +162,34 @@ export function getPromoAssets(assetDir: string = './assets/promo-history'): Pro
       return [];
     }
     
-    const files = readdirSync(assetDir);
+    // One listing with entry types, so subdirectories are skipped without a stat per entry;
+    // only symlinks need a stat to tell whether they point at a directory
+    const files = readdirSync(assetDir, { withFileTypes: true })
+      .filter(entry => !entry.isDirectory())
+      .filter(entry => !entry.isSymbolicLink() ||
+        !statSync(path.join(assetDir, entry.name), { throwIfNoEntry: false })?.isDirectory())
+      .map(entry => entry.name);
+    const fileNames = new Set(files);
+    const catalogedAt = new Date().toISOString();
     
     for (const file of files) {
       const filePath = path.join(assetDir, file);
       const extension = path.extname(file).toLowerCase();
       
-      let type = 'unknown';
-      if (['.jpg', '.jpeg', '.png', '.gif'].includes(extension)) {
-        type = 'image';
-      } else if (['.mp4', '.mov', '.avi', '.webm'].includes(extension)) {
-        type = 'video';
-      } else if (['.mp3', '.wav', '.ogg'].includes(extension)) {
-        type = 'audio';
-      } else if (extension === '.txt') {
-        type = 'text';
-      }
+      const type = ASSET_TYPES_BY_EXTENSION[extension] ?? 'unknown';
       
       // Get associated caption if exists
       const baseName = path.basename(file, extension);
-      const captionPath = path.join(assetDir, `${baseName}.txt`);
+      const captionFile = `${baseName}.txt`;
       let caption: string | undefined = undefined;
       
-      if (type !== 'text' && existsSync(captionPath)) {
-        caption = readFileSync(captionPath, 'utf-8');
+      // Check against the directory listing rather than stat-ing each candidate
+      if (type !== 'text' && fileNames.has(captionFile)) {
+        try {
+          caption = readFileSync(path.join(assetDir, captionFile), 'utf-8');
+        } catch {
+          // A dangling caption symlink is listed but unreadable; treat it as no caption
+        }
       }
       
       assets.push({
@@ -177,7 +197,7 @@ export function getPromoAssets(assetDir: string = './assets/promo-history'): Pro
         path: filePath,
         caption,
         tags: [], // Could be expanded to parse tags from filenames or metadata
-        dateCreated: new Date().toISOString() // This could be replaced with actual file creation date
+        dateCreated: catalogedAt // This could be replaced with actual file creation date
       });
     }
     
@@ -237,11 +257,14 @@ export function fillTemplate(
   return filledTemplate;
 }
 
+// Matches {variableName} placeholders in template strings
+const TEMPLATE_VARIABLE_PATTERN = /\{(\w+)\}/g;
+
 /**
  * Replace variables in a string with user input values
  */
 function replaceVariables(text: string, variables: Record<string, any>): string {
-  return text.replace(/\{(\w+)\}/g, (match, key) => variables[key] || match);
+  return text.replace(TEMPLATE_VARIABLE_PATTERN, (match, key) => variables[key] || match);
 }
 
 // Test brand style for text overlays
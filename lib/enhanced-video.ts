@@ -10,6 +10,14 @@ import { BrandStyle } from './brand';
 const VIDEO_WIDTH = 1160;
 const VIDEO_HEIGHT = 1456;
 
+// Working directories and scene inputs
+const TMP_DIR = './output/tmp';
+const SCENES_DIR = './output/scenes';
+const REQUIRED_OVERLAYS = ['text_overlay_0.png', 'text_overlay_1.png', 'text_overlay_2.png'];
+
+// Scene image extensions we feed to ffmpeg
+const IMAGE_EXTENSIONS = ['.png', '.jpg'];
+
 interface SceneConfig {
   imagePath: string;
   overlayText?: string;
@@ -34,35 +42,39 @@ export async function createEnhancedVideo(
   console.log('\n=== Starting Video Creation Process ===');
   console.log('Output path:', outputVideoPath);
   
-  // Ensure output directory exists
+  // Ensure output directories exist; recursive mkdir returns undefined when nothing was created
   const outputDir = path.dirname(outputVideoPath);
-  if (!existsSync(outputDir)) {
-    console.log('Creating output directory:', outputDir);
-    mkdirSync(outputDir, { recursive: true });
+  if (mkdirSync(outputDir, { recursive: true })) {
+    console.log('Created output directory:', outputDir);
   }
   
-  const tmpDir = './output/tmp';
-  if (!existsSync(tmpDir)) {
-    console.log('Creating temporary directory:', tmpDir);
-    mkdirSync(tmpDir, { recursive: true });
+  if (mkdirSync(TMP_DIR, { recursive: true })) {
+    console.log('Created temporary directory:', TMP_DIR);
   }
   
   // Create temporary video file path
-  const tempVideoPath = path.join(tmpDir, 'temp_video.mp4');
+  const tempVideoPath = path.join(TMP_DIR, 'temp_video.mp4');
   
   // Check if we have all required overlay files
   console.log('\n=== Verifying Text Overlays ===');
-  const requiredOverlays = ['text_overlay_0.png', 'text_overlay_1.png', 'text_overlay_2.png'];
-  const scenesDir = './output/scenes';
-  
-  console.log('Checking scenes directory:', scenesDir);
-  if (!existsSync(scenesDir)) {
+  console.log('Checking scenes directory:', SCENES_DIR);
+  if (!existsSync(SCENES_DIR)) {
     throw new Error('Scenes directory not found');
   }
   
-  console.log('Required overlays:', requiredOverlays.join(', '));
-  const missingOverlays = requiredOverlays.filter(overlay => {
-    const exists = existsSync(path.join(scenesDir, overlay));
+  // List the scenes directory once and reuse it for both the overlay check and the image list
+  let allFiles: string[];
+  try {
+    allFiles = readdirSync(SCENES_DIR);
+  } catch (error) {
+    console.error('Error reading scenes directory:', error);
+    throw error;
+  }
+  const sceneFiles = new Set(allFiles);
+  
+  console.log('Required overlays:', REQUIRED_OVERLAYS.join(', '));
+  const missingOverlays = REQUIRED_OVERLAYS.filter(overlay => {
+    const exists = sceneFiles.has(overlay);
     console.log(`${overlay}: ${exists ? '✓ Found' : '✗ Missing'}`);
     return !exists;
   });
@@ -73,38 +85,35 @@ export async function createEnhancedVideo(
   
   // Check if we have any valid image files
   console.log('\n=== Processing Image Files ===');
-  let validImages: string[] = [];
+  console.log('Total files in directory:', allFiles.length);
   
-  try {
-    const allFiles = readdirSync(scenesDir);
-    console.log('Total files in directory:', allFiles.length);
-    
-    validImages = allFiles
-      .filter(file => {
-        const isValid = file.endsWith('.png') || file.endsWith('.jpg');
-        console.log(`${file}: ${isValid ? '✓ Valid' : '✗ Invalid'} format`);
-        return isValid;
-      })
-      .sort((a, b) => {
-        // Sort text overlays in correct order
-        if (a.startsWith('text_overlay_') && b.startsWith('text_overlay_')) {
-          return parseInt(a.match(/\d+/)?.[0] || '0') - parseInt(b.match(/\d+/)?.[0] || '0');
-        }
-        // Put background images before text overlays
-        if (a.startsWith('text_overlay_')) return 1;
-        if (b.startsWith('text_overlay_')) return -1;
-        return a.localeCompare(b);
-      })
-      .map(file => path.join(scenesDir, file));
-    
-    console.log('\nProcessed images in order:');
-    validImages.forEach((img, index) => {
-      console.log(`${index + 1}. ${path.basename(img)}`);
-    });
-  } catch (error) {
-    console.error('Error reading scenes directory:', error);
-    throw error;
-  }
+  const validImages = allFiles
+    .filter(file => {
+      const isValid = IMAGE_EXTENSIONS.some(ext => file.endsWith(ext));
+      console.log(`${file}: ${isValid ? '✓ Valid' : '✗ Invalid'} format`);
+      return isValid;
+    })
+    // Parse each overlay's index once up front instead of on every comparison
+    .map(file => ({
+      file,
+      overlayIndex: file.startsWith('text_overlay_') ? parseInt(file.match(/\d+/)?.[0] || '0') : -1
+    }))
+    .sort((a, b) => {
+      // Sort text overlays in correct order
+      if (a.overlayIndex >= 0 && b.overlayIndex >= 0) {
+        return a.overlayIndex - b.overlayIndex;
+      }
+      // Put background images before text overlays
+      if (a.overlayIndex >= 0) return 1;
+      if (b.overlayIndex >= 0) return -1;
+      return a.file.localeCompare(b.file);
+    })
+    .map(({ file }) => path.join(SCENES_DIR, file));
+  
+  console.log('\nProcessed images in order:');
+  validImages.forEach((img, index) => {
+    console.log(`${index + 1}. ${path.basename(img)}`);
+  });
   
   if (validImages.length > 0) {
     try {
@@ -1,12 +1,34 @@
-import { writeFileSync, existsSync, mkdirSync } from "fs";
-import fetch from 'node-fetch';
+import { writeFileSync, createWriteStream } from "fs";
+import fetch, { RequestInit, Response } from 'node-fetch';
+import https from 'https';
 import path from 'path';
+import { pipeline } from 'stream/promises';
 import fs from 'fs';
 import { createCanvas } from 'canvas';
+import { ensureDirExists } from './utils';
 
-// Debug log for API key
-console.log('API Key length:', process.env.OPENAI_API_KEY?.length);
-console.log('API Key prefix:', process.env.OPENAI_API_KEY?.substring(0, 10));
+const IMAGE_GENERATION_URL = "https://api.openai.com/v1/images/generations";
+
+// Scene descriptions used for every generated set of images
+const SCENE_DESCRIPTIONS = [
+  "A DJ silhouette in an industrial underground space, backlit by neon magenta and chrome green lights, with analog equipment and vinyl crates visible in the shadows",
+  "Close-up of vintage mixer knobs and faders, bathed in tape-burn orange light, with a blurred crowd of dancer silhouettes in the background",
+  "Wide-angle shot of an underground archive room, dusty light beams revealing rows of vinyl records, with holographic catalog numbers floating in the air"
+];
+
+// Reuse TLS connections to the OpenAI API and its image CDN across requests
+const keepAliveAgent = new https.Agent({ keepAlive: true });
+
+// Retry policy for image generation requests that were turned away before any work was done:
+// rate limited (429) or service unavailable (503). Other 5xx responses, notably gateway
+// errors and timeouts (502/504), may already have produced a billed image, so they are not retried.
+const RETRYABLE_STATUSES = new Set([429, 503]);
+const MAX_GENERATION_RETRIES = 3;
+const RETRY_BASE_DELAY_MS = 1000;
+const RETRY_MAX_DELAY_MS = 20000;
+
+// Values shipped in .env.example / README that mean no real key was configured
+const PLACEHOLDER_API_KEYS = new Set(['', 'your_openai_api_key_here', 'your_api_key_here']);
 
 interface ImageGenerationResponse {
   data: Array<{
@@ -28,34 +50,82 @@ interface StyleGuide {
   };
 }
 
-function constructImagePrompt(baseScene: string, styleGuide: StyleGuide): string {
-  // Get current timestamp for metadata
-  const timestamp = new Date().toISOString().split('T')[0];
-  const catalogId = Math.floor(Math.random() * 9999).toString().padStart(4, '0');
+const STYLE_GUIDE_PATH = './config/thumbnail_style_guide.json';
+
+let cachedStyleGuide: { mtimeMs: number; size: number; styleGuide: StyleGuide } | null = null;
+
+/**
+ * Loads the thumbnail style guide, re-parsing only when the file has changed
+ */
+function loadStyleGuide(): StyleGuide {
+  const { mtimeMs, size } = fs.statSync(STYLE_GUIDE_PATH);
   
-  // Core aesthetic foundation
-  const aestheticBase = `Create a scene that embodies a Blade Runner meets Boiler Room aesthetic. 
-The image should feel like a recovered artifact from an underground music archive. `;
+  if (!cachedStyleGuide || cachedStyleGuide.mtimeMs !== mtimeMs || cachedStyleGuide.size !== size) {
+    const styleGuide = JSON.parse(fs.readFileSync(STYLE_GUIDE_PATH, 'utf8')) as StyleGuide;
+    cachedStyleGuide = { mtimeMs, size, styleGuide };
+  }
   
-  // Color palette specification
-  const colorSpec = `Use a stark color palette:
+  return cachedStyleGuide.styleGuide;
+}
+
+// Static sections of the image prompt, built once rather than on every call
+
+// Core aesthetic foundation
+const AESTHETIC_BASE = `Create a scene that embodies a Blade Runner meets Boiler Room aesthetic. 
+The image should feel like a recovered artifact from an underground music archive. `;
+
+// Color palette specification
+const COLOR_SPEC = `Use a stark color palette:
 - Primary: jet black, asphalt grey, midnight navy
 - Accent: holographic neon (hot magenta, chrome green, purple haze)
 - Highlight: tape-burn orange and dusty pink for archival contrast
 Ensure deep shadows and high contrast lighting with stark backlighting or neon bleed. `;
-  
-  // Texture and composition layers
-  const textureSpec = `Apply multiple texture layers:
+
+// Texture and composition layers
+const TEXTURE_SPEC = `Apply multiple texture layers:
 1. Base: Kodak 400TX style grain structure
 2. Overlay: VHS static and vinyl record scratches
 3. Surface: Rusted steel grunge and analog distortion
 4. Edge: Subtle vignette with light leak effects `;
-  
-  const compositionSpec = `Frame the composition using:
+
+const COMPOSITION_SPEC = `Frame the composition using:
 - Wide-angle urban isolation (1-point perspective)
 - Low angles with dramatic spotlight focus
 - Industrial architecture elements
 - Subjects silhouetted against neon sources `;
+
+/**
+ * Sends a request, retrying 429/503 responses with exponential backoff and full jitter,
+ * so concurrent scene requests that are throttled together do not retry in lockstep.
+ * A Retry-After header (in seconds) takes precedence, capped at RETRY_MAX_DELAY_MS plus
+ * a random offset of up to RETRY_BASE_DELAY_MS.
+ */
+async function fetchWithBackoff(url: string, init: RequestInit): Promise<Response> {
+  for (let attempt = 0; ; attempt++) {
+    const response = await fetch(url, init);
+    const retryable = RETRYABLE_STATUSES.has(response.status);
+    
+    if (!retryable || attempt >= MAX_GENERATION_RETRIES) {
+      return response;
+    }
+    
+    // Drain the error body so the keep-alive socket can be reused
+    await response.text();
+    
+    const retryAfterSeconds = Number(response.headers.get('retry-after'));
+    const delay = retryAfterSeconds > 0
+      ? Math.min(RETRY_MAX_DELAY_MS, retryAfterSeconds * 1000) + Math.random() * RETRY_BASE_DELAY_MS
+      : Math.random() * Math.min(RETRY_MAX_DELAY_MS, RETRY_BASE_DELAY_MS * 2 ** attempt);
+    
+    console.log(`Image API returned ${response.status}, retrying in ${Math.round(delay)}ms...`);
+    await new Promise(resolve => setTimeout(resolve, delay));
+  }
+}
+
+function constructImagePrompt(baseScene: string, styleGuide: StyleGuide): string {
+  // Get current timestamp for metadata
+  const timestamp = new Date().toISOString().split('T')[0];
+  const catalogId = Math.floor(Math.random() * 9999).toString().padStart(4, '0');
   
   // Technical overlay elements
   const metadataOverlay = `Include IBM Plex Mono typography overlays:
@@ -73,10 +143,10 @@ Additional elements:
 - Metadata timestamp burn-ins `;
   
   // Final composition
-  return `${aestheticBase}
-${colorSpec}
-${textureSpec}
-${compositionSpec}
+  return `${AESTHETIC_BASE}
+${COLOR_SPEC}
+${TEXTURE_SPEC}
+${COMPOSITION_SPEC}
 ${enhancedScene}
 ${metadataOverlay}
 Technical requirements: Ensure high contrast, cinematic composition with strong emphasis on lighting and atmosphere. The final image should feel like a recovered artifact from an underground archive.`;
@@ -84,44 +154,38 @@ Technical requirements: Ensure high contrast, cinematic composition with strong
 
 export async function generateImages(script: string): Promise<string[]> {
   // Ensure output directories exist
-  const outputDir = "./output";
-  if (!existsSync(outputDir)) {
-    mkdirSync(outputDir, { recursive: true });
-  }
-  
   const scenesDir = "./output/scenes";
-  if (!existsSync(scenesDir)) {
-    mkdirSync(scenesDir, { recursive: true });
-  }
+  ensureDirExists(scenesDir);
 
   const imagePaths: string[] = [];
+  const apiKey = process.env.OPENAI_API_KEY?.trim() ?? '';
+  const hasApiKey = !PLACEHOLDER_API_KEYS.has(apiKey);
   
   try {
     // Load style guide
-    const styleGuide = JSON.parse(fs.readFileSync('./config/thumbnail_style_guide.json', 'utf8')) as StyleGuide;
+    const styleGuide = loadStyleGuide();
     
-    // Generate scene descriptions based on the script
-    const scenes = [
-      "A DJ silhouette in an industrial underground space, backlit by neon magenta and chrome green lights, with analog equipment and vinyl crates visible in the shadows",
-      "Close-up of vintage mixer knobs and faders, bathed in tape-burn orange light, with a blurred crowd of dancer silhouettes in the background",
-      "Wide-angle shot of an underground archive room, dusty light beams revealing rows of vinyl records, with holographic catalog numbers floating in the air"
-    ];
-    
-    // Generate images using OpenAI's image generation API
-    for (let i = 0; i < scenes.length; i++) {
-      const scene = scenes[i];
+    // Generate images using OpenAI's image generation API. Scenes are independent,
+    // so request them concurrently; Promise.all keeps the results in scene order.
+    const generatedPaths = await Promise.all(SCENE_DESCRIPTIONS.map(async (scene, i) => {
       const imagePath = path.join(scenesDir, `section_${i}_branded.png`);
       
       try {
-        console.log(`Generating image ${i + 1}/${scenes.length}...`);
+        // Go straight to the fallback image rather than making a request that is bound to fail
+        if (!hasApiKey) {
+          throw new Error('OPENAI_API_KEY is missing or still set to the placeholder value');
+        }
+
+        console.log(`Generating image ${i + 1}/${SCENE_DESCRIPTIONS.length}...`);
         
         // Construct enhanced prompt with Subsonic Archive style
         const fullPrompt = constructImagePrompt(scene, styleGuide);
         
-        const response = await fetch("https://api.openai.com/v1/images/generations", {
+        const response = await fetchWithBackoff(IMAGE_GENERATION_URL, {
           method: "POST",
+          agent: keepAliveAgent,
           headers: {
-            "Authorization": `Bearer ${process.env.OPENAI_API_KEY}`,
+            "Authorization": `Bearer ${apiKey}`,
             "Content-Type": "application/json"
           },
           body: JSON.stringify({
@@ -143,15 +207,15 @@ export async function generateImages(script: string): Promise<string[]> {
 
         // Download and save the image
         console.log(`Downloading generated image...`);
-        const imgRes = await fetch(imageUrl);
+        const imgRes = await fetch(imageUrl, { agent: keepAliveAgent });
         
-        if (!imgRes.ok) {
+        if (!imgRes.ok || !imgRes.body) {
           throw new Error(`Failed to download image: ${imgRes.status}`);
         }
         
-        const buffer = await imgRes.arrayBuffer();
-        writeFileSync(imagePath, Buffer.from(buffer));
-        imagePaths.push(imagePath);
+        // Stream straight to disk instead of buffering the whole image in memory
+        await pipeline(imgRes.body, createWriteStream(imagePath));
+        return imagePath;
         
       } catch (error) {
         console.error(`Error generating image ${i + 1}:`, error);
@@ -177,9 +241,11 @@ export async function generateImages(script: string): Promise<string[]> {
         }
         
         writeFileSync(imagePath, canvas.toBuffer());
-        imagePaths.push(imagePath);
+        return imagePath;
       }
-    }
+    }));
+    
+    imagePaths.push(...generatedPaths);
   } catch (error) {
     console.error("Error in image generation process:", error);
     const fallbackPath = path.join(scenesDir, "scene_fallback.png");
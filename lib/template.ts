@@ -1,12 +1,10 @@
 import { BrandStyle, loadTemplate, fillTemplate } from './brand';
-import sharp from 'sharp';
 import path from 'path';
-import { writeFileSync, existsSync, mkdirSync } from 'fs';
+import { existsSync } from 'fs';
 import { generateImages } from './images';
-import { generateScript } from './gpt';
 import { generateAudio } from './audio';
-import { createCanvas } from 'canvas';
 import { generateTextOverlay } from './text-overlay';
+import { ensureDirExists } from './utils';
 
 interface VideoSection {
   type: string;
@@ -53,9 +51,7 @@ export async function processTemplate(
   
   // Ensure output directory exists
   const outputDir = './output/scenes';
-  if (!existsSync(outputDir)) {
-    mkdirSync(outputDir, { recursive: true });
-  }
+  ensureDirExists(outputDir);
 
   // Process each section
   for (let i = 0; i < filledTemplate.sections.length; i++) {
@@ -151,7 +147,8 @@ async function processSection(
             // Create a processed version of the image with brand styling
             const processedPath = path.join(outputDir, `section_${sectionIndex}_branded.png`);
             
-            // Apply filters using sharp
+            // Apply filters using sharp, loaded on demand since only this branch needs it
+            const { default: sharp } = await import('sharp');
             await sharp(bgImage)
               .modulate({
                 brightness: brandStyle.imageFilters.brightness,
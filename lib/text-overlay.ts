@@ -2,6 +2,11 @@ import { createCanvas } from 'canvas';
 import fs from 'fs';
 import path from 'path';
 import { BrandStyle } from './brand';
+import { ensureDirExists } from './utils';
+
+// Overlays are intermediate frames read back by ffmpeg, so favour encode speed
+// over file size (zlib level 1 instead of the default 6)
+const OVERLAY_PNG_COMPRESSION_LEVEL = 1;
 
 interface TextStyle {
   fontSize?: number;
@@ -84,12 +89,9 @@ export function generateTextOverlay(
   }
 
   // Ensure output directory exists
-  const dir = path.dirname(outputPath);
-  if (!fs.existsSync(dir)) {
-    fs.mkdirSync(dir, { recursive: true });
-  }
+  ensureDirExists(path.dirname(outputPath));
 
   // Write to file
-  const buffer = canvas.toBuffer('image/png');
+  const buffer = canvas.toBuffer('image/png', { compressionLevel: OVERLAY_PNG_COMPRESSION_LEVEL });
   fs.writeFileSync(outputPath, buffer);
 } 
\ No newline at end of file
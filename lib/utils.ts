@@ -1,11 +1,10 @@
-import { existsSync, mkdirSync } from 'fs';
+import { mkdirSync } from 'fs';
 
 /**
  * Ensures a directory exists, creating it recursively if it doesn't
  * @param dirPath The directory path to ensure exists
  */
 export function ensureDirExists(dirPath: string): void {
-  if (!existsSync(dirPath)) {
-    mkdirSync(dirPath, { recursive: true });
-  }
+  // Recursive mkdir is a no-op for existing directories, so skip the extra stat
+  mkdirSync(dirPath, { recursive: true });
 } 
\ No newline at end of file